@@ -3,22 +3,27 @@ Gematria REST API
 Provides endpoints for Hebrew gematria calculations and lookups.
 """
 from contextlib import asynccontextmanager
-from typing import List
+from hashlib import blake2b
+from typing import List, Optional
 from urllib.parse import quote_plus
 import os
 
-from fastapi import FastAPI, Depends, Query
+from fastapi import FastAPI, Depends, Header, Path, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from sqlalchemy import create_engine, Column, BigInteger, Text, Integer, Index
-from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, ConfigDict
+from sqlalchemy import select, func, bindparam, Integer
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from dotenv import load_dotenv
+import redis.asyncio as redis
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Import gematria calculation functions
-from backend import get_gematria, _normalize
+from backend import gematria_from_normalized, normalize_and_sum
+from models import GematriaWord, TOP_WORDS_CACHE_PREFIX, create_schema
 
 # ============================================================================
 # Configuration
@@ -34,58 +39,96 @@ def get_database_url() -> str:
     # URL-encode password to handle special characters
     encoded_password = quote_plus(db_password)
 
-    return f"postgresql://{db_username}:{encoded_password}@{db_endpoint}:{db_port}/{db_name}"
+    return f"postgresql+asyncpg://{db_username}:{encoded_password}@{db_endpoint}:{db_port}/{db_name}"
 
 DATABASE_URL = get_database_url()
 
-# ============================================================================
-# Database Models
-# ============================================================================
-Base = declarative_base()
+# Async workers each serve many requests, so one per core is enough
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
 
-class GematriaWord(Base):
-    __tablename__ = "gematria_words"
+# Every worker has its own pool, so the connection budget is split between
+# them; keep it below the server's max_connections (100 on stock Postgres).
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS") or 90)
+DB_CONNECTIONS_PER_WORKER = max(DB_MAX_CONNECTIONS // WEB_CONCURRENCY, 1)
+DB_POOL_SIZE = max(DB_CONNECTIONS_PER_WORKER * 2 // 3, 1)
+DB_MAX_OVERFLOW = DB_CONNECTIONS_PER_WORKER - DB_POOL_SIZE
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
-    text = Column(Text, nullable=False)
-    normalized = Column(Text, nullable=False, unique=True)
-    gematria = Column(Integer, nullable=False)
-    created_at = Column(Text, nullable=False)
+# Optional read-through cache for /gematria/top (disabled when unset)
+REDIS_URL = os.getenv("REDIS_URL")
+# Short enough that an unreachable Redis falls through to the database
+# instead of stalling every request
+REDIS_TIMEOUT_SECONDS = float(os.getenv("REDIS_TIMEOUT_SECONDS", "0.25"))
+TOP_WORDS_CACHE_TTL = int(os.getenv("TOP_WORDS_CACHE_TTL", "60"))
 
-    __table_args__ = (
-        Index('idx_gematria_words_gematria_desc', 'gematria'),
-        Index('idx_gematria_words_created_at_desc', 'created_at'),
-    )
+# Bounds the work an attacker-controlled word can cause
+MAX_WORD_LENGTH = 256
+
+NO_HEBREW_MESSAGE = "Word must contain at least one Hebrew character"
+
+# /gematria/word/{word} is a pure function of the URL, so HTTP caches may
+# keep it indefinitely
+WORD_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 # ============================================================================
 # Database Setup
 # ============================================================================
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=30,
+    pool_pre_ping=True
+)
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
-def get_db():
+async def get_db():
     """Dependency for database session."""
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+def get_cache(http_request: Request) -> Optional[redis.Redis]:
+    """Dependency for the Redis cache client (None when caching is disabled)."""
+    return http_request.app.state.redis
 
 # ============================================================================
 # Pydantic Models (Request/Response)
 # ============================================================================
 class WordRequest(BaseModel):
+    model_config = ConfigDict(str_max_length=MAX_WORD_LENGTH)
+
     word: str = Field(..., min_length=1, description="Hebrew word to calculate gematria for")
 
+    _normalized: str = PrivateAttr("")
+
     @field_validator('word')
     @classmethod
     def validate_hebrew(cls, v: str) -> str:
         """Ensure the word contains Hebrew characters."""
-        normalized = _normalize(v)
+        normalized, _ = normalize_and_sum(v)
         if not normalized:
-            raise ValueError("Word must contain at least one Hebrew character")
+            raise ValueError(NO_HEBREW_MESSAGE)
         return v
 
+    def model_post_init(self, __context) -> None:
+        # Served from normalize_and_sum's cache, filled by the validator above
+        self._normalized = normalize_and_sum(self.word)[0]
+
+    @property
+    def normalized(self) -> str:
+        """Normalized form of the word, computed once during validation."""
+        return self._normalized
+
+class HealthResponse(BaseModel):
+    status: str
+    service: str
+    version: str
+    method: str
+
 class GematriaResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -113,8 +156,17 @@ async def lifespan(application: FastAPI):
     print(f"   Endpoint: {os.getenv('DB_ENDPOINT', 'NOT SET')}")
     print(f"   Database: {os.getenv('DB_NAME', 'NOT SET')}")
 
+    application.state.redis = redis.from_url(
+        REDIS_URL,
+        socket_timeout=REDIS_TIMEOUT_SECONDS,
+        socket_connect_timeout=REDIS_TIMEOUT_SECONDS
+    ) if REDIS_URL else None
+    if application.state.redis is None:
+        print("⚠️  REDIS_URL not set, /gematria/top results will not be cached")
+
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
         print("✓ Database tables initialized")
         print("✓ Gematria API ready (Mispar Gadol method)")
     except Exception as e:
@@ -123,8 +175,11 @@ async def lifespan(application: FastAPI):
 
     yield
 
-    # Shutdown (if needed)
+    # Shutdown
     print("Shutting down...")
+    if application.state.redis is not None:
+        await application.state.redis.aclose()
+    await engine.dispose()
 
 # ============================================================================
 # FastAPI Application
@@ -136,27 +191,139 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# CORS middleware for web app access
+class PublicCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware with a fast path for requests that carry no Origin header."""
+
+    def __init__(self, app: ASGIApp, **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        # Precomputed once. Responses to no-Origin requests still carry them,
+        # so a shared cache never stores a copy that cross-origin clients
+        # would be refused.
+        self.static_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in self.simple_headers.items()
+        ] + [(b"vary", b"Origin")]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or any(
+            name == b"origin" for name, _ in scope["headers"]
+        ):
+            await super().__call__(scope, receive, send)
+            return
+
+        async def send_with_static_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *self.static_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_static_headers)
+
+# CORS middleware for web app access. The API is public and uses no cookies,
+# so credentials stay off and the wildcard origin can be a static header.
 app.add_middleware(
-    CORSMiddleware,
+    PublicCORSMiddleware,
     allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_credentials=False,
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
+# ============================================================================
+# Query Helpers
+# ============================================================================
+# Built once at import so each request only binds parameters; the compiled
+# SQL is reused from SQLAlchemy's cache and asyncpg's prepared statements.
+# COUNT(*) OVER () is evaluated before LIMIT, so one round trip returns both
+# the page of words and the total number of matches. The trade-off is that
+# the window aggregate reads every matching row (heap fetches included)
+# instead of stopping at LIMIT; the ordered index still spares the sort.
+# Only plain columns are selected, so no ORM instances are built.
+TOP_WORDS_STMT = select(
+    GematriaWord.text,
+    GematriaWord.normalized,
+    GematriaWord.gematria,
+    func.count().over().label("total")
+).where(
+    GematriaWord.gematria == bindparam("gematria")
+).order_by(
+    GematriaWord.created_at.desc(),
+    GematriaWord.id.desc()
+).limit(bindparam("limit", type_=Integer))
+
+async def fetch_top_words(
+    db: AsyncSession,
+    cache: Optional[redis.Redis],
+    gematria: int,
+    limit: int
+) -> TopWordsResponse:
+    """Return the top words for a gematria value, reading through the cache."""
+    cache_key = f"{TOP_WORDS_CACHE_PREFIX}{gematria}:{limit}"
+
+    if cache is not None:
+        try:
+            cached = await cache.get(cache_key)
+        except redis.RedisError:
+            cached = None
+        if cached is not None:
+            return TopWordsResponse.model_validate_json(cached)
+
+    rows = (await db.execute(
+        TOP_WORDS_STMT, {"gematria": gematria, "limit": limit}
+    )).all()
+
+    response = TopWordsResponse(
+        gematria=gematria,
+        count=rows[0].total if rows else 0,
+        words=[
+            GematriaResponse(
+                word=text,
+                normalized=normalized,
+                gematria=value
+            )
+            for text, normalized, value, _ in rows
+        ]
+    )
+
+    if cache is not None:
+        try:
+            await cache.set(cache_key, response.model_dump_json(), ex=TOP_WORDS_CACHE_TTL)
+        except redis.RedisError:
+            pass
+
+    return response
+
+def word_etag(word: str, gematria: int) -> str:
+    """Build the ETag for a word response (the body depends only on the word)."""
+    digest = blake2b(word.encode("utf-8"), digest_size=8).hexdigest()
+    return f'W/"{gematria}-{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
-@app.get("/", tags=["Health"])
+# Every route declares a response_model so FastAPI serializes straight to
+# JSON bytes through Pydantic's Rust core instead of jsonable_encoder + json.
+@app.get("/", response_model=HealthResponse, tags=["Health"])
 async def root():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": "Hebrew Gematria API",
-        "version": "1.0.0",
-        "method": "Mispar Gadol"
-    }
+    return HealthResponse(
+        status="healthy",
+        service="Hebrew Gematria API",
+        version="1.0.0",
+        method="Mispar Gadol"
+    )
 
 @app.post("/gematria/calculate", response_model=GematriaResponse, tags=["Gematria"])
 async def calculate_gematria(request: WordRequest):
@@ -168,17 +335,18 @@ async def calculate_gematria(request: WordRequest):
     Returns the word, its normalized form, and gematria value.
     Does not store the word in the database.
     """
-    normalized = _normalize(request.word)
-    gematria_value = get_gematria(request.word)
-
     return GematriaResponse(
         word=request.word,
-        normalized=normalized,
-        gematria=gematria_value
+        normalized=request.normalized,
+        gematria=gematria_from_normalized(request.normalized)
     )
 
 @app.post("/gematria/top", response_model=TopWordsResponse, tags=["Gematria"])
-async def get_top_words(request: TopWordsRequest, db: Session = Depends(get_db)):
+async def get_top_words(
+    request: TopWordsRequest,
+    db: AsyncSession = Depends(get_db),
+    cache: Optional[redis.Redis] = Depends(get_cache)
+):
     """
     Get top N words with a specific gematria value.
 
@@ -187,34 +355,14 @@ async def get_top_words(request: TopWordsRequest, db: Session = Depends(get_db))
 
     Returns words ordered by creation date (most recent first).
     """
-    words = db.query(GematriaWord).filter(
-        GematriaWord.gematria == request.gematria
-    ).order_by(
-        GematriaWord.created_at.desc()
-    ).limit(request.limit).all()
-
-    total_count = db.query(GematriaWord).filter(
-        GematriaWord.gematria == request.gematria
-    ).count()
-
-    return TopWordsResponse(
-        gematria=request.gematria,
-        count=total_count,
-        words=[
-            GematriaResponse(
-                word=w.text,
-                normalized=w.normalized,
-                gematria=w.gematria
-            )
-            for w in words
-        ]
-    )
+    return await fetch_top_words(db, cache, request.gematria, request.limit)
 
 @app.get("/gematria/top/{gematria}", response_model=TopWordsResponse, tags=["Gematria"])
 async def get_top_words_by_url(
     gematria: int,
     limit: int = Query(10, ge=1, le=100, description="Number of results to return (max 100)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    cache: Optional[redis.Redis] = Depends(get_cache)
 ):
     """
     Get top N words with a specific gematria value (GET method).
@@ -226,42 +374,41 @@ async def get_top_words_by_url(
 
     Returns words ordered by creation date (most recent first).
     """
-    words = db.query(GematriaWord).filter(
-        GematriaWord.gematria == gematria
-    ).order_by(
-        GematriaWord.created_at.desc()
-    ).limit(limit).all()
-
-    total_count = db.query(GematriaWord).filter(
-        GematriaWord.gematria == gematria
-    ).count()
-
-    return TopWordsResponse(
-        gematria=gematria,
-        count=total_count,
-        words=[
-            GematriaResponse(
-                word=w.text,
-                normalized=w.normalized,
-                gematria=w.gematria
-            )
-            for w in words
-        ]
-    )
+    return await fetch_top_words(db, cache, gematria, limit)
 
 @app.get("/gematria/word/{word}", response_model=GematriaResponse, tags=["Gematria"])
-async def get_word_gematria(word: str):
+async def get_word_gematria(
+    response: Response,
+    word: str = Path(..., max_length=MAX_WORD_LENGTH, description="Hebrew word to look up"),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get gematria for a specific word (GET alternative to POST /calculate).
 
     - **word**: Hebrew word to look up
     """
-    request = WordRequest(word=word)
-    normalized = _normalize(request.word)
-    gematria_value = get_gematria(request.word)
+    # normalize_and_sum is memoized on the raw word, so repeated lookups
+    # skip both request-model validation and the regex pass.
+    normalized, gematria_value = normalize_and_sum(word)
+    if not normalized:
+        # Same shape as the body validation error from POST /gematria/calculate
+        raise RequestValidationError([{
+            "type": "value_error",
+            "loc": ("path", "word"),
+            "msg": f"Value error, {NO_HEBREW_MESSAGE}",
+            "input": word
+        }])
+
+    cache_headers = {
+        "ETag": word_etag(word, gematria_value),
+        "Cache-Control": WORD_CACHE_CONTROL
+    }
+    if etag_matches(if_none_match, cache_headers["ETag"]):
+        return Response(status_code=304, headers=cache_headers)
 
+    response.headers.update(cache_headers)
     return GematriaResponse(
-        word=request.word,
+        word=word,
         normalized=normalized,
         gematria=gematria_value
     )
@@ -269,6 +416,16 @@ async def get_word_gematria(word: str):
 # ============================================================================
 # Main Entry Point
 # ============================================================================
+# For production, the same setup under Gunicorn:
+#   gunicorn -w $WEB_CONCURRENCY -k uvicorn.workers.UvicornWorker api:app
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(
+        "api:app",
+        host=os.getenv("API_HOST", "0.0.0.0"),
+        port=int(os.getenv("API_PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=WEB_CONCURRENCY,
+        access_log=False
+    )
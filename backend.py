@@ -4,6 +4,7 @@ Purpose: Correct, library-free Hebrew gematria computation
 """
 
 import re
+from functools import lru_cache
 
 # --------------------------------------------------
 # 1. Canonical Hebrew Gematria Map (Mispar Gadol)
@@ -27,13 +28,20 @@ GEMATRIA_MAP = {
 # - niqqud
 # - ta'amim
 # - non-Hebrew characters
+#
+# Niqqud and ta'amim (U+0591-U+05C7) fall outside the
+# letter block, so a single pass keeping only א..ת
+# (final letters included) strips all of them at once.
 # --------------------------------------------------
 
-NIQQUD_AND_TAAMIM = re.compile(r'[\u0591-\u05C7]')
-NON_HEBREW = re.compile(r'[^\u05D0-\u05EA\u05DA\u05DD\u05DF\u05E3\u05E5]')
+HEBREW_LETTERS = '\u05D0-\u05EA'
+NON_HEBREW = re.compile(f'[^{HEBREW_LETTERS}]')
 
 def _normalize(text: str) -> str:
-    text = NIQQUD_AND_TAAMIM.sub('', text)
+    # CPython records whether a str is pure ASCII, so this check is O(1)
+    # and lets empty or Latin-only input skip the regex engine entirely.
+    if text.isascii():
+        return ''
     return NON_HEBREW.sub('', text)
 
 # --------------------------------------------------
@@ -50,8 +58,41 @@ def get_gematria(text: str) -> int:
     Returns:
         int: Gematria value.
     """
-    text = _normalize(text)
-    return sum(GEMATRIA_MAP.get(ch, 0) for ch in text)
+    return normalize_and_sum(text)[1]
+
+# Results are pure functions of the input string, so repeated
+# words (common in API traffic) are served from memory. This is
+# the only cache: everything it calls is left uncached so a word
+# is stored once.
+CACHE_SIZE = 65536
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_and_sum(text: str) -> tuple[str, int]:
+    """
+    Normalize text and compute its gematria in one go.
+
+    Args:
+        text (str): Any string containing Hebrew text.
+
+    Returns:
+        tuple[str, int]: Normalized text and its gematria value.
+    """
+    normalized = _normalize(text)
+    return normalized, gematria_from_normalized(normalized)
+
+def gematria_from_normalized(normalized: str) -> int:
+    """
+    Compute gematria for text that has already been through _normalize().
+
+    Args:
+        normalized (str): Hebrew letters only (no niqqud or other characters).
+
+    Returns:
+        int: Gematria value.
+    """
+    # Normalized text only holds letters in GEMATRIA_MAP, so map() over the
+    # bound dict lookup keeps the whole per-letter loop in C.
+    return sum(map(GEMATRIA_MAP.__getitem__, normalized))
 
 # --------------------------------------------------
 # 4. Optional: Debug / Breakdown Helper
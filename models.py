@@ -0,0 +1,96 @@
+"""
+Gematria Database Models
+Shared SQLAlchemy model used by both the API and the seed script.
+"""
+from sqlalchemy import Column, BigInteger, DateTime, Index, Integer, String, Text, func, inspect
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.orm import declarative_base
+
+# ============================================================================
+# Database Models
+# ============================================================================
+Base = declarative_base()
+
+class GematriaWord(Base):
+    __tablename__ = "gematria_words"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    text = Column(Text, nullable=False)
+    normalized = Column(Text, nullable=False, unique=True)
+    gematria = Column(Integer, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    # Matches the /gematria/top access pattern (filter on gematria, newest
+    # first), so Postgres reads matches already in output order and needs no
+    # sort. The COUNT(*) OVER () in that query still visits every match.
+    # id breaks ties between rows inserted in the same transaction (now() is
+    # the transaction start time), so a page of results is deterministic.
+    # Lookups by normalized text use the index behind its unique constraint.
+    __table_args__ = (
+        Index('idx_gw_gem_created', gematria, created_at.desc(), id.desc()),
+    )
+
+# Redis key prefix for cached /gematria/top results; seed_db clears these
+# keys after inserting rows
+TOP_WORDS_CACHE_PREFIX = "top:"
+
+# ============================================================================
+# Schema Setup
+# ============================================================================
+# Arbitrary key for pg_advisory_xact_lock, shared by every process that
+# runs create_schema()
+SCHEMA_LOCK_KEY = 0x67656d61
+
+# Single-column indexes from earlier versions of the API and seed script,
+# replaced by idx_gw_gem_created
+LEGACY_INDEXES = (
+    "idx_gematria_words_gematria_desc",
+    "idx_gematria_words_created_at_desc",
+    "ix_gematria_words_gematria",
+)
+
+def create_schema(connection) -> None:
+    """
+    Create tables and bring an existing gematria_words table up to date.
+
+    Must run inside a transaction. On Postgres it first takes an advisory
+    lock, so concurrent callers (every API worker runs this at startup) go
+    one at a time and each inspects the schema only after the previous
+    caller's changes are committed.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SELECT pg_advisory_xact_lock({SCHEMA_LOCK_KEY})")
+
+    Base.metadata.create_all(connection)
+    if connection.dialect.name == "postgresql":
+        upgrade_created_at(connection)
+    for name in LEGACY_INDEXES:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    for index in GematriaWord.__table__.indexes:
+        index.create(connection, checkfirst=True)
+
+def upgrade_created_at(connection) -> None:
+    """
+    Convert a legacy created_at column to TIMESTAMPTZ.
+
+    Older tables stored created_at as TEXT (API) or as a naive
+    DATETIME (seed script); both sort incorrectly against the index.
+    The only writer was the seed script's datetime.utcnow(), so both
+    forms hold naive UTC values and are read as UTC regardless of the
+    server's TimeZone setting.
+    """
+    columns = inspect(connection).get_columns(GematriaWord.__tablename__)
+    column_type = next(c["type"] for c in columns if c["name"] == "created_at")
+
+    if isinstance(column_type, String):
+        using = "created_at::timestamp AT TIME ZONE 'UTC'"
+    elif isinstance(column_type, DateTime) and not column_type.timezone:
+        using = "created_at AT TIME ZONE 'UTC'"
+    else:
+        return
+
+    connection.exec_driver_sql(
+        "ALTER TABLE gematria_words "
+        f"ALTER COLUMN created_at TYPE TIMESTAMPTZ USING {using}, "
+        "ALTER COLUMN created_at SET DEFAULT now()"
+    )
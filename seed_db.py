@@ -1,63 +1,81 @@
-from datetime import datetime
 import os
 import re
-from sqlalchemy import Column, Integer, String, DateTime, create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+import redis
+
+from backend import HEBREW_LETTERS, gematria_from_normalized
+from models import GematriaWord, TOP_WORDS_CACHE_PREFIX, create_schema
 
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_ENDPOINT = os.getenv("DB_ENDPOINT")
 DB_NAME = os.getenv("DB_NAME")
 DB_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_ENDPOINT}/{DB_NAME}"
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_TIMEOUT_SECONDS = float(os.getenv("REDIS_TIMEOUT_SECONDS", "0.25"))
+BATCH_SIZE = 10_000
+
+
+# Same character set as backend.NON_HEBREW, but keeps line breaks so a whole
+# file can be normalized in a single pass and split into words afterwards.
+NON_HEBREW_EXCEPT_NEWLINE = re.compile(f'[^{HEBREW_LETTERS}\n]')
+
+
+def load_words(path: str) -> list[dict]:
+    """Read a word-per-line file and return rows ready for insertion."""
+    with open(path, encoding="utf-8") as file:
+        raw = file.read()
+
+    lines = raw.split("\n")
+    normalized = NON_HEBREW_EXCEPT_NEWLINE.sub('', raw).split("\n")
+    if raw.endswith("\n"):
+        lines.pop()
+        normalized.pop()
+
+    return [
+        {"text": line.strip(), "normalized": word, "gematria": gematria_from_normalized(word)}
+        for line, word in zip(lines, normalized)
+    ]
+
+
+def invalidate_top_words_cache():
+    """Drop cached /gematria/top results so the API sees the new rows."""
+    if not REDIS_URL:
+        return
+    try:
+        with redis.Redis.from_url(
+            REDIS_URL,
+            socket_timeout=REDIS_TIMEOUT_SECONDS,
+            socket_connect_timeout=REDIS_TIMEOUT_SECONDS
+        ) as client:
+            cursor = 0
+            while True:
+                cursor, keys = client.scan(cursor, match=f"{TOP_WORDS_CACHE_PREFIX}*")
+                if keys:
+                    client.delete(*keys)
+                if cursor == 0:
+                    break
+    except redis.RedisError as e:
+        # The rows are already committed; stale entries expire with their TTL
+        print(f"Could not clear cached /gematria/top results: {e}")
 
 
-Base = declarative_base()
-
-
-class GematriaWords(Base):
-    __tablename__ = "gematria_words"
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    text = Column(String, nullable=False)
-    normalized = Column(String, nullable=False, unique=True)
-    gematria = Column(Integer, nullable=False, index=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-
-
-def normalize(word: str) -> str:
-    return re.sub(r'[^א-ת]', '', word)
-
-
-gematria_values = {
-    "א": 1, "ב": 2, "ג": 3, "ד": 4, "ה": 5, "ו": 6, "ז": 7, "ח": 8, "ט": 9,
-    "י": 10, "כ": 20, "ך": 20, "ל": 30, "מ": 40, "ם": 40, "נ": 50, "ן": 50,
-    "ס": 60, "ע": 70, "פ": 80, "ף": 80, "צ": 90, "ץ": 90,
-    "ק": 100, "ר": 200, "ש": 300, "ת": 400,
-}
-
+def main():
+    engine = create_engine(DB_URL, echo=False)
+    with engine.begin() as connection:
+        create_schema(connection)
 
-def gematria_value(word: str) -> int:
-    return sum(gematria_values[char] for char in word)
+    Session = sessionmaker(bind=engine)
 
+    rows = load_words("words.txt")
 
-def main():
-    engine = create_engine(DB_URL, echo=True)
-    Base.metadata.create_all(engine)
+    with Session() as session:
+        for start in range(0, len(rows), BATCH_SIZE):
+            session.execute(insert(GematriaWord), rows[start:start + BATCH_SIZE])
+            session.commit()
 
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    with session.begin(), open("words.txt") as file:
-        for line in file:
-            stripped_word = normalize(line)
-            value = gematria_value(stripped_word)
-            session.add(
-                GematriaWords(
-                    text=line.strip(),
-                    normalized=stripped_word,
-                    gematria=value)
-            )
-        session.commit()
+    invalidate_top_words_cache()
 
 
 if __name__ == "__main__":